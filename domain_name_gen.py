@@ -1,10 +1,19 @@
 # @title domain_name_gen.py
 # Import necessary libraries
 import requests
-import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
 from google import generativeai as genai
 from google.colab import userdata
 from decimal import Decimal
+import re
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+import dbm
+import pickle
+import shelve
+import threading
 import time
 
 # MODULE: ENV VARIABLES
@@ -19,23 +28,32 @@ genai.configure(api_key=GOOGLE_API_KEY)
 # Define common domain extensions as a variable
 web_extension = ['.com']
 
+# Lowercased extensions as a frozenset so each domain is validated with one hash lookup
+_EXTS = frozenset(ext.lower() for ext in web_extension)
+
 # Create the Gemini model instance with parameter tuning options
 model = genai.GenerativeModel("gemini-1.5-flash")
 
 # Set to store all previously generated domain names
+# A plain set is kept on purpose: a run holds at most a few thousand names, and a probabilistic
+# filter (e.g. a Bloom filter) would silently drop valid names on false positives
 generated_domains_memory = set()
 
 # Function to generate domain names using Generative AI
-def generate_domain_names(topic_description, prompt_batch_size, max_price):
+def generate_domain_names(topic_description, prompt_batch_size, max_price, cancel_event=None):
     """
     Generate domain names based on a given topic description using Google Generative AI.
     Args:
         topic_description (str): Description of the domain.
         prompt_batch_size (int): Number of domain names to generate.
         max_price (Decimal): Maximum acceptable price for domain registration.
+        cancel_event (threading.Event, optional): When set, generation stops and nothing is returned.
     Returns:
-        list: List of generated domain names.
+        list: List of new domain names, already added to generated_domains_memory.
     """
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
     # Create a prompt template to ensure consistency in generated output
     prompt_template = """
     Please generate exactly {batch_size} creative and short domain names related to the topic: "{topic}".
@@ -43,77 +61,329 @@ def generate_domain_names(topic_description, prompt_batch_size, max_price):
     Each domain should be unique, memorable, and concise. Provide one domain per line, formatted exactly as follows: "domainname.com".
     Ensure that there are {batch_size} domain names generated without any deviation.
     """
-    # Fill the prompt with the given parameters
-    prompt = prompt_template.format(
-        batch_size=prompt_batch_size,
-        topic=topic_description,
-        extensions=', '.join(web_extension),
-        price=max_price
-    )
-
     domain_names = []
+    batch_memory = set()  # Names of this batch, only recorded in generated_domains_memory once generation completes
     attempts = 0
     max_attempts = 3  # Limit the number of retries to avoid infinite loops
     while len(domain_names) < prompt_batch_size and attempts < max_attempts:
+        if cancelled():
+            return []
+        # Fill the prompt with the given parameters, asking only for the names still missing
+        remaining = prompt_batch_size - len(domain_names)
+        prompt = prompt_template.format(
+            batch_size=remaining,
+            topic=topic_description,
+            extensions=', '.join(web_extension),
+            price=max_price
+        )
         try:
-            # Generate content using the configured generative AI model
+            # Stream content from the configured generative AI model so lines are validated while it decodes
             response = model.generate_content(
                 prompt,
                 generation_config=genai.types.GenerationConfig(
                     candidate_count=1,  # Generate only one candidate per request
-                    stop_sequences=["x"],  # Stop sequence placeholder (can be updated as required)
-                    max_output_tokens=8000,  # Increase to allow more tokens in response
+                    max_output_tokens=max(512, remaining * 20),  # About 20 tokens per domain line, with a floor for small batches
                     temperature=0.5,  # Decrease temperature to reduce variability
                 ),
+                stream=True,
             )
-            generated_text = response.text
-            lines = generated_text.strip().split('\n')
 
-            # Extract valid domain names from the response, and avoid generating names that already exist in memory
-            for line in lines:
-                line = line.strip().lstrip('0123456789.- ').strip()  # Clean up the generated line
-                if any(ext in line.lower() for ext in web_extension) and line.lower() not in generated_domains_memory:
-                    domain_names.append(line.lower())
+            # Extract valid domain names from each complete line, and avoid generating names that already exist in memory
+            buffer = ''
+            for chunk in response:
+                # Stop paying for tokens as soon as the caller no longer needs this batch
+                if cancelled():
+                    return []
+                buffer += chunk.text
+                *lines, buffer = buffer.split('\n')
+                domain_names.extend(validate_and_dedup(lines, batch_memory, exclude=generated_domains_memory))
+                # Stop consuming the stream as soon as enough names were collected
+                if len(domain_names) >= prompt_batch_size:
+                    break
+            else:
+                # The stream ended, so the last buffered line is complete as well
+                domain_names.extend(validate_and_dedup([buffer], batch_memory, exclude=generated_domains_memory))
 
             # Ensure the number of generated domains matches the prompt batch size
+            if cancelled():
+                return []
             if len(domain_names) < prompt_batch_size:
                 print(f"Warning: Only {len(domain_names)} domain names generated out of requested {prompt_batch_size}. Retrying...")
                 attempts += 1
-                prompt_batch_size -= len(domain_names)  # Adjust the batch size for the next attempt
         except Exception as e:
+            if cancelled():
+                return []
             # Handle exceptions and return an empty list in case of an error
             print(f"Error during domain generation: {str(e)}")
             attempts += 1
 
-    return domain_names[:prompt_batch_size]  # Return only the requested number of domain names
+    if cancelled():
+        return []
+    # Add the batch to the memory to avoid repetition; none are dropped by truncating to the batch size
+    generated_domains_memory.update(domain_names)
+    return domain_names
 
 # MODULE: DATA CONFIRMATION
-# Function to confirm the validity of generated domain names
-def confirm_generated_domains(domain_names):
+# Matches one generated line, skipping list numbering, bullets, markdown and quotes around the domain.
+# The domain is a single registrable label (no leading or trailing hyphen) followed by its extension.
+_LINE_RE = re.compile(r'^\s*(?:\d+[.)]\s+|[-*]\s*)?[*"\'`]*([a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.[a-z]{2,})[*"\'`]*\s*$', re.I)
+
+# Function to validate generated lines and keep only new domain names
+def validate_and_dedup(lines, memory, exclude=frozenset(), ext_set=_EXTS):
     """
-    Confirm that the generated domain names are valid and match the expected format.
+    Extract valid, previously unseen domain names from generated lines in a single pass.
     Args:
-        domain_names (list): List of generated domain names.
+        lines (list): Raw lines from the model output.
+        memory (set): Previously generated domain names, updated in place with the new ones.
+        exclude (set): Additional names to skip without updating them.
+        ext_set (frozenset): Accepted lowercase extensions, including the leading dot.
     Returns:
-        list: List of confirmed domain names.
+        list: List of new lowercase domain names.
     """
-    confirmed_domains = []
-    for domain in domain_names:
-        if any(ext in domain for ext in web_extension):
-            confirmed_domains.append(domain)
-    return confirmed_domains
+    new_domains = []
+    for line in lines:
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        domain = match.group(1).lower()
+        if '.' + domain.rsplit('.', 1)[-1] in ext_set and domain not in memory and domain not in exclude:
+            memory.add(domain)
+            new_domains.append(domain)
+    return new_domains
 
 # MODULE: API NAMECHEAP
-# Function to get domain prices using Namecheap API
-def get_domain_prices(domains):
+# Namespace used in the XML responses and selectors compiled once for every call
+_NS = {'nc': 'http://api.namecheap.com/xml.response'}
+_PRODUCT_TAG = '{' + _NS['nc'] + '}Product'
+_PRICE_XP = etree.XPath('.//nc:Price[@Duration="1"]', namespaces=_NS)
+_DOMAIN_CHECK_RESULTS = etree.XPath('//nc:DomainCheckResult', namespaces=_NS)
+_ERRORS_XP = etree.XPath('//nc:Errors/nc:Error', namespaces=_NS)
+
+# Shared HTTP session so every Namecheap call reuses pooled keep-alive connections
+_session_lock = threading.Lock()
+
+def _build_session():
     """
-    Check domain prices using Namecheap API.
+    Create a requests session with connection pooling and retries for the Namecheap API.
+    Returns:
+        requests.Session: Configured session instance.
+    """
+    session = requests.Session()
+    # Let the transport retry idempotent GETs with exponential backoff; Namecheap returns sporadic 405s that clear on retry
+    retry = Retry(
+        total=5,
+        backoff_factor=0.3,
+        status_forcelist=[405, 429, 500, 502, 503, 504],
+        allowed_methods=frozenset({'GET'}),
+    )
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=64, max_retries=retry))
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+_session = _build_session()
+
+def _reset_session(stale_session):
+    """
+    Replace the shared session, e.g. after the remote end closed a pooled connection.
     Args:
-        domains (list): List of domain names to check.
+        stale_session (requests.Session): The session that failed; it is only replaced if still shared.
     Returns:
-        dict: A dictionary with domain names as keys and their prices as values.
+        requests.Session: The current shared session.
+    """
+    global _session
+    with _session_lock:
+        # Several threads may hit the same outage; only the first one rebuilds the session
+        if _session is stale_session:
+            _session.close()
+            _session = _build_session()
+        return _session
+
+# Token bucket that lets requests burst while keeping under the Namecheap limit of 30 requests per minute
+RATE_LIMIT_REQUESTS = 30
+RATE_LIMIT_PERIOD = 60.0
+_rate_lock = threading.Lock()
+_rate_tokens = float(RATE_LIMIT_REQUESTS)
+_rate_updated = time.monotonic()
+
+def _wait_for_rate_limit():
+    """
+    Block until a token is available for the next Namecheap request, then consume it.
+    """
+    global _rate_tokens, _rate_updated
+    with _rate_lock:
+        while True:
+            now = time.monotonic()
+            # Refill the bucket in proportion to the time elapsed since the last update
+            _rate_tokens = min(RATE_LIMIT_REQUESTS, _rate_tokens + (now - _rate_updated) * RATE_LIMIT_REQUESTS / RATE_LIMIT_PERIOD)
+            _rate_updated = now
+            if _rate_tokens >= 1:
+                _rate_tokens -= 1
+                return
+            time.sleep((1 - _rate_tokens) * RATE_LIMIT_PERIOD / RATE_LIMIT_REQUESTS)
+
+def _namecheap_get(params, session=None):
+    """
+    Send a GET request to the Namecheap API using the shared session.
+    Args:
+        params (dict): Query parameters for the API call.
+        session (requests.Session, optional): Session to use instead of the shared one.
+    Returns:
+        requests.Response: The HTTP response.
     """
     base_url = 'https://api.sandbox.namecheap.com/xml.response'
+    _wait_for_rate_limit()
+    if session is not None:
+        return session.get(base_url, params=params)
+    with _session_lock:
+        session = _session
+    try:
+        return session.get(base_url, params=params)
+    except requests.exceptions.ConnectionError:
+        # The pooled connection may have been dropped by the server; retry once on a fresh session
+        session = _reset_session(session)
+        _wait_for_rate_limit()
+        return session.get(base_url, params=params)
+
+# On-disk cache of Namecheap responses shared across calls and runs
+CACHE_PATH = '.ncache'
+PRICING_CACHE_TTL = 3600  # Pricing is effectively static over an hour
+AVAILABILITY_CACHE_TTL = 300  # Availability can change, so keep it for a few minutes only
+_cache_lock = threading.Lock()
+# The cache is only an optimization: an unreadable, foreign-format or locked file counts as a miss
+_CACHE_ERRORS = (*dbm.error, OSError, pickle.UnpicklingError, EOFError, ValueError, SyntaxError)
+# TTL of each kind of entry by key prefix; keys matching none are left over from older versions
+_CACHE_TTLS = {'check:': AVAILABILITY_CACHE_TTL, 'getpricing:DOMAIN:index': PRICING_CACHE_TTL}
+_cache_pruned = False
+
+def _prune_cache():
+    """
+    Drop expired and superseded cache entries once per process. Must be called with _cache_lock held.
+    """
+    global _cache_pruned
+    if _cache_pruned:
+        return
+    _cache_pruned = True  # Set first so a failing prune is not retried on every access
+
+    now = time.time()
+    with shelve.open(CACHE_PATH) as cache:
+        entries = dict(cache)
+    live = {}
+    for key, entry in entries.items():
+        ttl = next((ttl for prefix, ttl in _CACHE_TTLS.items() if key.startswith(prefix)), None)
+        if ttl is not None and now - entry[0] < ttl:
+            live[key] = entry
+    if len(live) < len(entries):
+        # Rewrite the file rather than deleting keys, since dbm.dumb never reclaims the space of removed values
+        with shelve.open(CACHE_PATH, flag='n') as cache:
+            cache.update(live)
+
+def _cache_get_many(keys, ttl):
+    """
+    Read several values from the on-disk cache with a single open, keeping those younger than the given TTL.
+    Args:
+        keys (list): Cache keys.
+        ttl (int): Maximum age of the entries in seconds.
+    Returns:
+        dict: A dictionary with the fresh keys and their cached values.
+    """
+    now = time.time()
+    fresh = {}
+    try:
+        with _cache_lock:
+            _prune_cache()
+            with shelve.open(CACHE_PATH) as cache:
+                for key in keys:
+                    entry = cache.get(key)
+                    if entry is not None and now - entry[0] < ttl:
+                        fresh[key] = entry[1]
+    except _CACHE_ERRORS as e:
+        print(f"Error reading cache: {str(e)}")
+        return {}
+    return fresh
+
+def _cache_set_many(items):
+    """
+    Store several values in the on-disk cache with a single open, stamped with the current time.
+    Args:
+        items (dict): Cache keys and the picklable values to store.
+    """
+    if not items:
+        return
+    now = time.time()
+    try:
+        with _cache_lock:
+            _prune_cache()
+            with shelve.open(CACHE_PATH) as cache:
+                for key, value in items.items():
+                    cache[key] = (now, value)
+    except _CACHE_ERRORS as e:
+        print(f"Error writing cache: {str(e)}")
+
+def _cache_get(key, ttl):
+    """
+    Read a value from the on-disk cache if it is younger than the given TTL.
+    Args:
+        key (str): Cache key.
+        ttl (int): Maximum age of the entry in seconds.
+    Returns:
+        The cached value, or None if missing or expired.
+    """
+    return _cache_get_many([key], ttl).get(key)
+
+def _cache_set(key, value):
+    """
+    Store a value in the on-disk cache together with the current timestamp.
+    Args:
+        key (str): Cache key.
+        value: Picklable value to store.
+    """
+    _cache_set_many({key: value})
+
+def _build_tld_index(content):
+    """
+    Parse the pricing XML and index the 1 year registration price by TLD.
+    Args:
+        content (bytes): Raw pricing XML returned by the Namecheap API.
+    Returns:
+        dict: A dictionary with lowercase TLDs (without the dot) as keys and their prices as values.
+    Raises:
+        ValueError: If the API reported an error or the response holds no domain prices.
+    """
+    tld_index = {}
+    # Stream the pricing document and free each product once read to keep memory flat
+    context = etree.iterparse(BytesIO(content), events=('end',), tag=_PRODUCT_TAG)
+    for _, product in context:
+        # Get price for 1 year registration if available
+        price_elements = _PRICE_XP(product)
+        if price_elements:
+            tld = product.get('Name', product.get('name', '')).lower().lstrip('.')
+            tld_index.setdefault(tld, Decimal(price_elements[0].get('Price', '0')))
+        # Empty the product and detach the already processed siblings so the tree does not keep them
+        product.clear()
+        while product.getprevious() is not None:
+            del product.getparent()[0]
+
+    # Namecheap reports API errors (e.g. bad key, IP not whitelisted) with HTTP 200 and Status="ERROR"
+    if context.root.get('Status') != 'OK':
+        errors = '; '.join(error.text or '' for error in _ERRORS_XP(context.root))
+        raise ValueError(f"Namecheap API error: {errors or 'unknown error'}")
+    if not tld_index:
+        raise ValueError("Namecheap API returned no domain prices")
+    return tld_index
+
+def _fetch_tld_index(session=None):
+    """
+    Get the TLD price index, served from the cache when fresh.
+    Only a successfully parsed, non-empty index is cached, so API errors are not remembered across calls.
+    Args:
+        session (requests.Session, optional): Session to use instead of the shared one.
+    Returns:
+        dict: A dictionary with lowercase TLDs (without the dot) as keys and their prices as values.
+    """
+    tld_index = _cache_get('getpricing:DOMAIN:index', PRICING_CACHE_TTL)
+    if tld_index is not None:
+        return tld_index
+
     params = {
         'ApiUser': API_USER,
         'ApiKey': API_KEY,
@@ -122,91 +392,139 @@ def get_domain_prices(domains):
         'Command': 'namecheap.domains.getpricing',
         'ProductType': 'DOMAIN'
     }
+    # Make a request to the Namecheap API to get pricing details
+    response = _namecheap_get(params, session)
+    response.raise_for_status()  # Add error check for HTTP request issues
+    tld_index = _build_tld_index(response.content)
+    _cache_set('getpricing:DOMAIN:index', tld_index)
+    return tld_index
 
+# Function to get domain prices using Namecheap API
+def get_domain_prices(domains, session=None):
+    """
+    Check domain prices using Namecheap API.
+    Args:
+        domains (list): List of domain names to check.
+        session (requests.Session, optional): Session to use instead of the shared one.
+    Returns:
+        dict: A dictionary with domain names as keys and their prices as values.
+    """
     try:
-        # Make a request to the Namecheap API to get pricing details
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()  # Add error check for HTTP request issues
-        root = ET.fromstring(response.content)
-
-        # Define namespace used in the XML response
-        ns = {'nc': 'http://api.namecheap.com/xml.response'}
-
-        domain_prices = {}
-        for domain in domains:
-            tld = domain.split('.')[-1]
-
-            # Find the TLD pricing element in the response XML
-            for product in root.findall('.//nc:ProductType/nc:ProductCategory/nc:Product', ns):
-                if product.get('name').lower() == f'.{tld}'.lower():
-                    # Get price for 1 year registration if available
-                    price_element = product.find('.//nc:Price[@Duration="1"]', ns)
-                    if price_element is not None:
-                        price = Decimal(price_element.get('Price', '0'))
-                        domain_prices[domain] = price
-                        break
-
-            # If price wasn't found, set a high default price to indicate unavailability
-            if domain not in domain_prices:
-                domain_prices[domain] = Decimal('999999')
-
-        return domain_prices
+        tld_index = _fetch_tld_index(session)
+
+        # Look up the 1 year registration price of each domain's TLD, defaulting to a high price when not found
+        return {domain: tld_index.get(domain.rsplit('.', 1)[-1].lower(), Decimal('999999')) for domain in domains}
     except requests.exceptions.RequestException as e:
         # Handle HTTP request exceptions and return high price for all domains in case of error
         print(f"Error getting prices: {str(e)}")
         return {domain: Decimal('999999') for domain in domains}
-    except ET.ParseError as e:
+    except etree.XMLSyntaxError as e:
         # Handle XML parsing exceptions
         print(f"Error parsing XML response: {str(e)}")
         return {domain: Decimal('999999') for domain in domains}
+    except ValueError as e:
+        # Handle errors reported by the API itself
+        print(f"Error getting prices: {str(e)}")
+        return {domain: Decimal('999999') for domain in domains}
 
-# Function to check domain availability using Namecheap API
-def check_domain_availability(domain):
+# Maximum number of domains accepted by a single namecheap.domains.check call
+DOMAIN_CHECK_BATCH_SIZE = 50
+
+# Maximum number of batch requests kept in flight at the same time
+DOMAIN_CHECK_CONCURRENCY = 10
+
+def _check_domain_batch(batch, session=None):
     """
-    Check domain availability using Namecheap API for a single domain.
+    Check availability of a single batch of domains with one Namecheap API request.
     Args:
-        domain (str): Domain name to check.
+        batch (list): Up to 50 domain names to check.
+        session (requests.Session, optional): Session to use instead of the shared one.
     Returns:
-        bool: True if domain is available, False otherwise.
+        dict: A dictionary with domain names as keys and availability (bool) as values.
     """
-    base_url = 'https://api.sandbox.namecheap.com/xml.response'
+    availability = {domain: False for domain in batch}
+    # The API may change the case of a domain, so results are matched case-insensitively
+    batch_domains = {domain.lower(): domain for domain in batch}
+    checked = {}
     params = {
         'ApiUser': API_USER,
         'ApiKey': API_KEY,
         'UserName': USER_NAME,
         'ClientIp': CLIENT_IP,
         'Command': 'namecheap.domains.check',
-        'DomainList': domain
+        'DomainList': ','.join(batch)
     }
 
     try:
-        # Make a request to the Namecheap API to check domain availability
-        response = requests.get(base_url, params=params)
+        # Make a single request to the Namecheap API for the whole batch
+        response = _namecheap_get(params, session)
         response.raise_for_status()  # Add error check for HTTP request issues
-        root = ET.fromstring(response.content)
-        ns = {'nc': 'http://api.namecheap.com/xml.response'}
-
-        # Parse the response to determine if the domain is available
-        domain_check_result = root.find('.//nc:DomainCheckResult', ns)
-        if domain_check_result is not None:
-            available = domain_check_result.get('Available', '').lower() == 'true'
-            return available
-        return False
+        root = etree.fromstring(response.content)
+
+        # Parse every result in the response to determine which domains are available
+        for domain_check_result in _DOMAIN_CHECK_RESULTS(root):
+            domain = domain_check_result.get('Domain', '').lower()
+            if domain in batch_domains:
+                availability[batch_domains[domain]] = domain_check_result.get('Available', '').lower() == 'true'
+                checked[f'check:{domain}'] = availability[batch_domains[domain]]
     except requests.exceptions.RequestException as e:
-        # Handle HTTP request exceptions and return False if unable to check availability
+        # Handle HTTP request exceptions and leave the batch marked as unavailable
         print(f"Error checking availability: {str(e)}")
-        return False
-    except ET.ParseError as e:
+    except etree.XMLSyntaxError as e:
         # Handle XML parsing exceptions
         print(f"Error parsing XML response: {str(e)}")
-        return False
+
+    # Only answers actually returned by the API are cached, in one write for the whole batch
+    _cache_set_many(checked)
+    return availability
+
+# Function to check domain availability using Namecheap API
+def check_domains_availability(domains, session=None):
+    """
+    Check domain availability using Namecheap API, sending batches of up to 50 domains concurrently.
+    Args:
+        domains (list): List of domain names to check.
+        session (requests.Session, optional): Session to use instead of the shared one.
+    Returns:
+        dict: A dictionary with domain names as keys and availability (bool) as values.
+    """
+    # Reuse recent results and only send the remaining domains to the API
+    cached = _cache_get_many([f'check:{domain.lower()}' for domain in domains], AVAILABILITY_CACHE_TTL)
+    availability = {}
+    unchecked_domains = []
+    for domain in domains:
+        key = f'check:{domain.lower()}'
+        if key in cached:
+            availability[domain] = cached[key]
+        else:
+            unchecked_domains.append(domain)
+
+    batches = [unchecked_domains[start:start + DOMAIN_CHECK_BATCH_SIZE] for start in range(0, len(unchecked_domains), DOMAIN_CHECK_BATCH_SIZE)]
+    if not batches:
+        return availability
+
+    # Overlap the round-trips of the batches; request starts are still spaced by the rate limiter
+    with ThreadPoolExecutor(max_workers=min(DOMAIN_CHECK_CONCURRENCY, len(batches))) as executor:
+        for batch_availability in executor.map(lambda batch: _check_domain_batch(batch, session), batches):
+            availability.update(batch_availability)
+    return availability
+
+def check_domain_availability(domain, session=None):
+    """
+    Check domain availability using Namecheap API for a single domain.
+    Args:
+        domain (str): Domain name to check.
+        session (requests.Session, optional): Session to use instead of the shared one.
+    Returns:
+        bool: True if domain is available, False otherwise.
+    """
+    return check_domains_availability([domain], session)[domain]
 
 # MODULE: ORCHESTRATION
 # Orchestrator function to get available domains within budget
-# STEP 1: Generate domain names using LLM
-# STEP 2: Confirm domain format using DATA CONFIRMATION
-# STEP 3: Get domain prices using API NAMECHEAP
-# STEP 4: Check domain availability using API NAMECHEAP
+# STEP 1: Generate domain names using LLM, validated and deduplicated with DATA CONFIRMATION
+# STEP 2: Get domain prices using API NAMECHEAP
+# STEP 3: Check domain availability using API NAMECHEAP
 def find_available_domains(topic_description, max_price):
     """
     Find available domains based on topic description, price, and availability.
@@ -214,53 +532,56 @@ def find_available_domains(topic_description, max_price):
         topic_description (str): Description of the domain.
         max_price (Decimal): Maximum acceptable price for domain registration.
     Returns:
-        list: List of available domain names within the budget.
+        list: List of (domain name, price) tuples for available domains within the budget.
     """
     available_domains = []
     attempt = 0
     max_attempts = 5  # Maximum number of attempts to generate domains and find available ones
 
-    while not available_domains and attempt < max_attempts:
-        attempt += 1
-        # STEP 1: Generate 200 domain names using the generative AI model (LLM)
-        domain_names = generate_domain_names(topic_description, prompt_batch_size=200, max_price=max_price)
-
-        # STEP 2: Confirm that the generated domains are in the correct format (DATA CONFIRMATION)
-        confirmed_domains = confirm_generated_domains(domain_names)
-
-        # Filter out previously generated domain names
-        new_domain_names = [domain for domain in confirmed_domains if domain not in generated_domains_memory]
-
-        # Add newly generated names to the memory to avoid repetition
-        generated_domains_memory.update(new_domain_names)
-
-        if not new_domain_names:
-            print("No new domain names generated. Generating new batch...")
-            continue
-
-        # STEP 3: Get the prices for the entire batch of new domain names (API NAMECHEAP)
-        domain_prices = get_domain_prices(new_domain_names)
-
-        # STEP 4: Process each domain to check availability with a delay of 2 seconds per request (API NAMECHEAP)
-        for domain in new_domain_names:
-            # Get the price of the domain
-            price = domain_prices.get(domain, Decimal('999999'))
+    # Run LLM generation in the background so the next batch is produced while Namecheap checks the current one
+    llm_executor = ThreadPoolExecutor(max_workers=1)
+    cancel_generation = threading.Event()
+    next_batch = llm_executor.submit(generate_domain_names, topic_description, prompt_batch_size=200, max_price=max_price, cancel_event=cancel_generation)
 
-            # Check if the domain is within the budget and available
-            if price <= max_price:
-                is_available = check_domain_availability(domain)
-                time.sleep(2)  # Respect Namecheap API limit of 30 requests per minute
-
-                if is_available:
-                    available_domains.append(domain)
+    try:
+        while not available_domains and attempt < max_attempts:
+            attempt += 1
+            # STEP 1: Generate 200 domain names using the generative AI model (LLM)
+            # Names come back validated, deduplicated and recorded in generated_domains_memory (DATA CONFIRMATION)
+            new_domain_names = next_batch.result()
+
+            # Start generating the next batch now that the memory excludes this one
+            if attempt < max_attempts:
+                next_batch = llm_executor.submit(generate_domain_names, topic_description, prompt_batch_size=200, max_price=max_price, cancel_event=cancel_generation)
+
+            if not new_domain_names:
+                print("No new domain names generated. Generating new batch...")
+                continue
+
+            # STEP 2: Get the prices for the entire batch of new domain names (API NAMECHEAP)
+            domain_prices = get_domain_prices(new_domain_names)
+
+            # Keep only the domains within the budget so no availability checks are spent on the rest
+            affordable_domains = [domain for domain in new_domain_names if domain_prices.get(domain, Decimal('999999')) <= max_price]
+
+            # STEP 3: Check availability of the affordable domains in batches (API NAMECHEAP)
+            availability = check_domains_availability(affordable_domains)
+            for domain in new_domain_names:
+                price = domain_prices.get(domain, Decimal('999999'))
+                if price > max_price:
+                    print(f"{domain} is not within the price range (Price: ${price:.2f}).")
+                elif availability[domain]:
+                    available_domains.append((domain, price))
                     print(f"{domain} is available for ${price:.2f}.")
                 else:
                     print(f"{domain} is not available.")
-            else:
-                print(f"{domain} is not within the price range (Price: ${price:.2f}).")
 
-        if not available_domains:
-            print(f"\nNo available domains found within your budget in attempt {attempt}. Generating new batch...")
+            if not available_domains:
+                print(f"\nNo available domains found within your budget in attempt {attempt}. Generating new batch...")
+    finally:
+        # Stop a speculative batch that is no longer needed; a running one exits at its next stream chunk
+        cancel_generation.set()
+        llm_executor.shutdown(wait=False, cancel_futures=True)
 
     return available_domains
 
@@ -275,9 +596,7 @@ available_domains = find_available_domains(topic_description, max_price)
 # Display available domains
 if available_domains:
     print("\nAvailable domains within your budget:")
-    for domain in available_domains:
-        # Retrieve the price again for displaying purposes
-        price = get_domain_prices([domain])[domain]
+    for domain, price in available_domains:
         print(f"{domain} - ${price:.2f}")
 else:
     print("\nNo available domains found within your budget after maximum attempts.")